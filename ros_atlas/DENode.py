@@ -1,67 +1,35 @@
 import sys
-import time
 import os
 import rospy
+import numpy as np
 
 sys.path.append("lib/")
 
 from core.BaseInference import BaseInferenceNode
 from custom_ros_msgs.msg import AdaBins
-from rospy.exceptions import ROSException, ROSSerializationException, ROSInterruptException
-from cv_bridge import CvBridge, CvBridgeError
+from rospy.numpy_msg import numpy_msg
+from utils.msg_utils import make_image_msg
+from utils.tools import inference_node_parser
 
 class DepthEstNode(BaseInferenceNode):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **pipeline_kwargs):
+        super().__init__(**pipeline_kwargs)
 
     def construct_ros_msg(self, model_output, img):
-        try:
-            detection_msg = AdaBins()
-            detection_msg.header.stamp = rospy.Time.now()
-            detection_msg.array1.list = model_output[0].flatten().tolist()
-            detection_msg.img = CvBridge().cv2_to_imgmsg(img)
-            return detection_msg
-        except CvBridgeError as err:
-            raise err
-
-    def run(self, model):
-        while not rospy.is_shutdown():
-            st = time.time()
-            try:
-                if not self.image_queue.empty():
-                    image = self.image_queue.get()
-                    
-                    preprocessed = model.preprocess(image)
-                    model_output = model.model.execute([preprocessed])
-
-                    ros_inference_msg = self.construct_ros_msg(model_output, image)
-                    self.inference_pub.publish(ros_inference_msg)
-                    self.pub_counter += 1
-                    print(f"[{self.pub_counter}]: Published model output(s) to topic: {self._inference_topic}")
-
-                    self.inference_pub_rate.sleep()
-
-                    self._iteration_times.append(time.time() - st)
-                else:
-                    continue
-
-            except CvBridgeError as err:
-                    rospy.logerr("Ran into exception when converting message type with CvBridge. See error below:")
-                    raise err
-            except ROSSerializationException as err:
-                rospy.logerr("Ran into exception when serializing message for publish. See error below:")
-                raise err
-            except ROSException as err:
-                raise err
-            except ROSInterruptException as err:
-                rospy.loginfo("ROS Interrupt.")
-                raise err
+        detection_msg = numpy_msg(AdaBins)()
+        stamp = rospy.Time.now()
+        detection_msg.header.stamp = stamp
+        detection_msg.array1.list = model_output[0].astype(np.float32, copy=False).ravel()
+        detection_msg.img = make_image_msg(img, stamp)
+        return detection_msg
 
 
 if __name__ == "__main__":
-    de_inference_node = DepthEstNode()
+    args = inference_node_parser(description="Depth Estimation Inference ROS Node").parse_args()
+
+    de_inference_node = DepthEstNode(max_batch_size=args.max_batch_size, max_latency_ms=args.max_latency_ms)
     de_model = de_inference_node.load_model("indoor_depth_estimation")
-    de_inference_node.init()
+    de_inference_node.init(shared_memory=args.shared_memory)
     try:
         de_inference_node.run(de_model)
     except KeyboardInterrupt as e:
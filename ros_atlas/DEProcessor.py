@@ -14,15 +14,15 @@ class DEPostNode(Postprocessor):
         super().__init__()
     
     def deconstruct_ros_msg(self, msg):
-        array_1 = np.reshape(np.array(msg.array1.list), (1, 1, 240, 320))
+        array_1 = np.reshape(msg.array1.list, (1, 1, 240, 320))
         return [array_1]
 
     def run(self, processor, img_format):
         while not rospy.is_shutdown():
-            st = time.time()
-            if not self.message_queue.empty():
+            message = self.next_message()
+            if message is not None:
                 try:
-                    message = self.message_queue.get()
+                    st = time.time()
                     model_output = self.deconstruct_ros_msg(message)
                     # frame = CvBridge().imgmsg_to_cv2(message.img)
 
@@ -1,74 +1,54 @@
 import sys
-import time
 import os
+import threading
 import rospy
+import numpy as np
 
 sys.path.append("lib/")
 
 from core.BaseInference import BaseInferenceNode
 from custom_ros_msgs.msg import FaceDetection
-from rospy.exceptions import ROSException, ROSSerializationException, ROSInterruptException
-from cv_bridge import CvBridge, CvBridgeError
+from rospy.numpy_msg import numpy_msg
+from utils.msg_utils import make_image_msg
+from utils.tools import inference_node_parser
 
 class FDInferNode(BaseInferenceNode):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **pipeline_kwargs):
+        super().__init__(**pipeline_kwargs)
 
     def construct_ros_msg(self, model_output, img):
-        try:
-            detection_msg = FaceDetection()
-            detection_msg.header.stamp = rospy.Time.now()
-            detection_msg.array1.list = model_output[0].flatten().tolist()
-            detection_msg.array2.list = model_output[1].flatten().tolist()
-            detection_msg.array3.list = model_output[2].flatten().tolist()
-            detection_msg.img = CvBridge().cv2_to_imgmsg(img)
-            return detection_msg
-        except CvBridgeError as err:
-            raise err
-    
-    def run(self, model):
-        """Main loop for inference. Make inference with model on images from CameraPublisher and publish.
-        @param:model    - a ModelProcessor object 
-        Returns:
-            None
-        """
-        while not rospy.is_shutdown():
-            st = time.time()
-            try:
-                if not self.image_queue.empty():
-                    image = self.image_queue.get()
-                    
-                    preprocessed = model.preprocess(image)
-                    model_output = model.model.execute([preprocessed])
+        detection_msg = numpy_msg(FaceDetection)()
+        stamp = rospy.Time.now()
+        detection_msg.header.stamp = stamp
+        detection_msg.array1.list = model_output[0].astype(np.float32, copy=False).ravel()
+        detection_msg.array2.list = model_output[1].astype(np.float32, copy=False).ravel()
+        detection_msg.array3.list = model_output[2].astype(np.float32, copy=False).ravel()
+        detection_msg.img = make_image_msg(img, stamp)
+        return detection_msg
 
-                    ros_inference_msg = self.construct_ros_msg(model_output, image)
-                    self.inference_pub.publish(ros_inference_msg)
-                    self.pub_counter += 1
-                    print(f"[{self.pub_counter}]: Published model output(s) to topic: {self._inference_topic}")
 
-                    self.inference_pub_rate.sleep()
-                    self._iteration_times.append(time.time() - st)
-                else:
-                    continue
-
-            except CvBridgeError as err:
-                    rospy.logerr("Ran into exception when converting message type with CvBridge. See error below:")
-                    raise err
-            except ROSSerializationException as err:
-                rospy.logerr("Ran into exception when serializing message for publish. See error below:")
-                raise err
-            except ROSException as err:
-                raise err
-            except ROSInterruptException as err:
-                rospy.loginfo("ROS Interrupt.")
-                raise err
-
-   
 if __name__ == "__main__":
+    parser = inference_node_parser(description="Face Detection Inference ROS Node")
+    parser.add_argument("--intra-process", dest='intra_process', action='store_true', help='Run the CameraPublisher inside this process and skip message serialization')
+    parser.add_argument("--live-feed", dest='live_feed', action='store_true', help='Use live-feed from drone (intra-process only)')
+    parser.add_argument("--fps", default=10, type=int, help='Camera FPS (intra-process only)')
+    args = parser.parse_args()
+    # both would feed the single-producer frame ring
+    if args.intra_process and args.shared_memory:
+        parser.error("--intra-process and --shm are mutually exclusive")
+
     print(f"FDNode pid: {os.getpid()}")
-    fd_inference_node = FDInferNode()
+    fd_inference_node = FDInferNode(max_batch_size=args.max_batch_size, max_latency_ms=args.max_latency_ms)
     fd_model = fd_inference_node.load_model("face_detection")
-    fd_inference_node.init()
+    fd_inference_node.init(intra_process=args.intra_process, shared_memory=args.shared_memory)
+
+    if args.intra_process:
+        from core.CameraPublisher import CameraPublisher
+        from ros_atlas.utils.uav_utils import connect_uav
+
+        uav = connect_uav() if args.live_feed else None
+        cam_pub = CameraPublisher(uav=uav, fps=args.fps, frame_sink=fd_inference_node.enqueue_frame)
+        threading.Thread(target=cam_pub.start_publish, args=(args.live_feed,), daemon=True).start()
     try:
         fd_inference_node.run(fd_model)
     except KeyboardInterrupt as e:
@@ -14,17 +14,17 @@ class FDPostNode(Postprocessor):
         super().__init__()
     
     def deconstruct_ros_msg(self, msg):
-        array_1 = np.reshape(np.array(msg.array1.list), (1, 13, 13, 18))
-        array_2 = np.reshape(np.array(msg.array2.list), (1, 26, 26, 18))
-        array_3 = np.reshape(np.array(msg.array3.list), (1, 52, 52, 18))
+        array_1 = np.reshape(msg.array1.list, (1, 13, 13, 18))
+        array_2 = np.reshape(msg.array2.list, (1, 26, 26, 18))
+        array_3 = np.reshape(msg.array3.list, (1, 52, 52, 18))
         return [array_1, array_2, array_3]
     
     def run(self, processor, img_format):
         while not rospy.is_shutdown():
-            st = time.time()
-            if not self.message_queue.empty():
+            message = self.next_message()
+            if message is not None:
                 try:
-                    message = self.message_queue.get()
+                    st = time.time()
                     model_output = self.deconstruct_ros_msg(message)
                     frame = CvBridge().imgmsg_to_cv2(message.img)
 
@@ -59,6 +59,6 @@ if __name__ == "__main__":
     fd_processor = fd_postprocess_node.load_processor("face_detection")
     fd_postprocess_node.init()
     try:
-        fd_postprocess_node.run(fd_processor, 'rgb8')
+        fd_postprocess_node.run(fd_processor, 'bgr8')
     except KeyboardInterrupt as e:
         rospy.signal_shutdown("Shutting down Postprocessor. Keyboard terminate")
\ No newline at end of file
@@ -11,30 +11,50 @@ limitations under the License.
 """
 
 from abc import abstractmethod
+import threading
 import time
-from queue import Queue
+from queue import Queue, Empty, Full
+import numpy as np
 import rospy
 
+from rospy.numpy_msg import numpy_msg
 from sensor_msgs.msg import Image
-from cv_bridge import CvBridge, CvBridgeError
-from rospy.exceptions import ROSInitException
+from cv_bridge import CvBridgeError
+from rospy.exceptions import ROSException, ROSSerializationException, ROSInitException, ROSInterruptException
 
 from utils.tools import load_model_processor
+from core.FrameRing import FrameRing
+from core.SharedFrameBuffer import SharedFrameBuffer
+from custom_ros_msgs.msg import SharedFrame
 
 
 class BaseInferenceNode:
-    def __init__(self):
+    def __init__(self, ring_size=5, pipeline_depth=1, max_batch_size=1, max_latency_ms=0, max_fps=30):
         """AclInference Node - Listens and makes inference on incoming sensor data (images) from TelloUAV object and publish results to /acl_inference/results topic
         @param:
             model_name      - Name of the supported model (refer to params.py for keynames)   @type:String
             inference_rate  - Inference rate of model_name.                                   @type:Int
-            qsize           - Size of global queue for thread-wise reference.                 @type:Int 
+            ring_size       - Number of preallocated frame buffers shared with the callback.  @type:Int 
+            pipeline_depth  - Capacity of the queues between preprocess, execute and publish. @type:Int
+            max_batch_size  - Max number of queued frames stacked into one model execution.   @type:Int
+                              Only set above 1 for models converted (atc) with that batch size.
+            max_latency_ms  - How long to wait for more frames to fill a batch.               @type:Int
+            max_fps         - Frames arriving faster than this are dropped before the ring.  @type:Int
         Returns:
             None
         
         Users need to inherit from baseInference and extend the abstractmethods
         """
-        self.image_queue = Queue(maxsize=1)
+        self.frame_ring = FrameRing(num_slots=ring_size)
+        self._shared_frames = None
+        self._pipeline_depth = pipeline_depth
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency_ms / 1000.
+        # 10% below the nominal period, so arrival jitter of a source running at max_fps doesn't get every other frame dropped
+        self._min_frame_interval = 0.9 / max_fps
+        self._last_accept_ts = 0.
+        # first exception raised by a pipeline worker thread, re-raised from run
+        self._worker_error = None
 
         # time performance metrics
         self._stamp_dict = dict()
@@ -50,18 +70,28 @@ class BaseInferenceNode:
         self._model_name = model_name
         return mp(params=model_info)
 
-    def init(self):
-        """Node initialization. Set Subscriber(s) and Publisher."""
+    def init(self, intra_process=False, shared_memory=False):
+        """Node initialization. Set Subscriber(s) and Publisher.
+        @param:
+            intra_process   - If True, skip the /tello/cam_data_raw Subscriber; frames are handed over in-process through enqueue_frame   @type:Bool
+            shared_memory   - If True, subscribe to /tello/cam_data_shm and read frames from the CameraPublisher's SharedFrameBuffer  @type:Bool
+        """
+        if intra_process and shared_memory:
+            raise ValueError("intra_process and shared_memory would both feed the single-producer frame ring, pick one")
         try:
             rospy.init_node('acl_inference_node', anonymous=True)
             rospy.loginfo("ACLInference Node initializing...")
 
             self._inference_topic = f"/acl_inference/{self._model_name}"
-            self._inference_msg_type = self._model_info["pub_message_type"]
+            self._pub_prefix = f"Published model output(s) to topic: {self._inference_topic}"
+            # numpy_msg serializes ndarray fields straight from their buffer instead of element by element
+            self._inference_msg_type = numpy_msg(self._model_info["pub_message_type"])
 
-            self.cam_data_sub = rospy.Subscriber("/tello/cam_data_raw", Image, self.image_callback, queue_size=1, buff_size=2**24)
+            if shared_memory:
+                self.cam_data_sub = rospy.Subscriber("/tello/cam_data_shm", SharedFrame, self.shared_frame_callback, queue_size=1)
+            elif not intra_process:
+                self.cam_data_sub = rospy.Subscriber("/tello/cam_data_raw", Image, self.image_callback, queue_size=1, buff_size=2**24)
             self.inference_pub = rospy.Publisher(self._inference_topic, self._inference_msg_type, queue_size=1)
-            self.inference_pub_rate = rospy.Rate(10)
             self.pub_counter = 0
             rospy.loginfo("ACLInference Node: Publisher & Subscriber initialized.")
         except ROSInitException as err:
@@ -76,27 +106,189 @@ class BaseInferenceNode:
             img_data    - ROS:SensorMessage.Image
             cam_info    - ROS:SesnorMessage.CameraInfo
         """
-        msg_publish_time = imgmsg.header.stamp
+        # zero-copy view over the message payload, skips CvBridge's per-frame conversion
+        frame = np.frombuffer(imgmsg.data, dtype=np.uint8).reshape(imgmsg.height, imgmsg.width, -1)
+        self.enqueue_frame(frame, imgmsg.header.stamp)
+
+    def shared_frame_callback(self, frame_msg):
+        """Subscriber callback for /tello/cam_data_shm - reads the announced slot from shared memory. Attaches on the first message, 
+        and re-attaches when the CameraPublisher restarted and recreated the segment
+        @params:
+            frame_msg   - slot index and frame dimensions from "uav_cam" node
+        @type:
+            frame_msg   - custom_ros_msgs.SharedFrame
+        """
+        if self._shared_frames is None or self._shared_frames.generation != frame_msg.generation:
+            if self._shared_frames is not None:
+                rospy.loginfo("CameraPublisher recreated its shared memory segment, re-attaching.")
+                self._shared_frames.close()
+            self._shared_frames = SharedFrameBuffer((frame_msg.height, frame_msg.width, 3), generation=frame_msg.generation)
+        shared_frames = self._shared_frames
+        # a callback delayed by a full lap of the segment would copy a frame the publisher is rewriting, drop it instead
+        self.enqueue_frame(shared_frames.read(frame_msg.slot), frame_msg.header.stamp,
+                           is_intact=lambda: not shared_frames.lapped(frame_msg.index))
+
+    def enqueue_frame(self, image, stamp, is_intact=None):
+        """Hands a frame over to the inference loop. Called by image_callback, or directly by an in-process CameraPublisher 
+        @params:
+            image       - frame from the drone camera
+            stamp       - time at which the frame was published
+            is_intact   - optional check, run after image is copied, that the source was not modified during the copy
+        @type:
+            image       - ndarray
+            stamp       - rospy.Time
+            is_intact   - Callable
+        """
         msg_arrival_time = rospy.Time.now()
         cb_start = time.time()
-        self._stamp_dict[msg_publish_time] = msg_arrival_time
-        
-        if not self.image_queue.full():
-            try:
-                rgb_img = CvBridge().imgmsg_to_cv2(imgmsg)
-                self.image_queue.put(rgb_img)
-                self._sub_cb_times.append(time.time() - cb_start)
-            except CvBridgeError as err:
-                raise err
+        self._stamp_dict[stamp] = msg_arrival_time
+
+        # throttle here rather than in the publisher, dropped frames never reach the ring or preprocess
+        if cb_start - self._last_accept_ts < self._min_frame_interval:
+            return
+        self._last_accept_ts = cb_start
+
+        if self.frame_ring.put(image, stamp, is_intact):
+            self._sub_cb_times.append(time.time() - cb_start)
 
     @abstractmethod
     def construct_ros_msg(self, model_output, img):
         """From model_output to expected ROS Message format"""
         pass
     
-    @abstractmethod
     def run(self, model):
-        pass
+        """Main loop for inference. Make inference with model on images from CameraPublisher and publish.
+        Runs as a 3-stage pipeline connected by bounded queues, so a frame is preprocessed while the previous one executes on the 
+        NPU and an older one is being published:
+            preprocess (worker thread) -> execute (calling thread) -> construct_ros_msg + publish (worker thread)
+        Execution is submitted asynchronously: frame N is queued on the NPU before frame N-1's outputs are copied back and 
+        handed to the publisher, so the device never idles on host-side work.
+        @param:model    - a ModelProcessor object 
+        Returns:
+            None
+        """
+        # preprocess outputs in flight: queued for execution + gathered into a batch + being written
+        model.num_buffers = self._pipeline_depth + self._max_batch_size + 1
+        preproc_q = Queue(maxsize=self._pipeline_depth)
+        exec_q = Queue(maxsize=self._pipeline_depth)
+        threading.Thread(target=self._run_worker, args=(self._preprocess_worker, model, preproc_q), daemon=True).start()
+        threading.Thread(target=self._run_worker, args=(self._publish_worker, exec_q), daemon=True).start()
+
+        pending = None
+        while not rospy.is_shutdown():
+            try:
+                batch = [preproc_q.get(timeout=0.1)]
+            except Empty:
+                # no frame to overlap with, don't hold the in-flight one back
+                if pending is not None:
+                    self._collect_execution(pending, exec_q)
+                    pending = None
+                continue
+
+            # drain frames that queued up (i.e. after a stall) into a single execution, up to max_batch_size
+            deadline = time.time() + self._max_latency
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(preproc_q.get(timeout=max(deadline - time.time(), 0)))
+                except Empty:
+                    break
+
+            if self._max_batch_size == 1:
+                model_input = batch[0][1]
+            else:
+                # a model converted for batch N only accepts exactly N frames - pad partial batches by repeating the last one
+                inputs = [p.reshape((1,) + p.shape[-3:]) for _, p, _ in batch]
+                inputs += [inputs[-1]] * (self._max_batch_size - len(inputs))
+                model_input = np.concatenate(inputs, axis=0)
+            handle = model.model.execute_async([model_input])
+            if pending is not None:
+                self._collect_execution(pending, exec_q)
+            pending = (batch, handle)
+
+        if self._worker_error is not None:
+            raise self._worker_error
+
+    def _collect_execution(self, pending, exec_q):
+        """Waits for a submitted execution and hands its outputs, split per frame, to the publish stage. Outputs of padding 
+        frames are dropped"""
+        batch, handle = pending
+        model_output = handle.wait() if handle is not None else None
+        if model_output is None:
+            # forwarded without outputs so the publish stage still frees their ring slots, in order
+            rospy.logerr_throttle(1.0, f"Model execution failed, skipping {len(batch)} frame(s)")
+            for image, _, st in batch:
+                self._put(exec_q, (image, None, st))
+            return
+        if self._max_batch_size == 1:
+            image, _, st = batch[0]
+            self._put(exec_q, (image, model_output, st))
+            return
+        for i, (image, _, st) in enumerate(batch):
+            self._put(exec_q, (image, [output[i:i + 1] for output in model_output], st))
+
+    @staticmethod
+    def _put(queue, item):
+        """Blocking put that gives up once the node shuts down, so a stage never waits on a consumer that has exited
+        Returns:
+            True if item was queued
+        """
+        while not rospy.is_shutdown():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _run_worker(self, target, *args):
+        """Thread entry point of a pipeline worker - an exception in the worker shuts the node down and is re-raised by run"""
+        try:
+            target(*args)
+        except Exception as err:
+            if self._worker_error is None:
+                self._worker_error = err
+            rospy.logerr(f"Inference pipeline worker {target.__name__} failed: {err!r}")
+            rospy.signal_shutdown(f"Inference pipeline worker {target.__name__} failed")
+
+    def _preprocess_worker(self, model, preproc_q):
+        """Pipeline stage 1 - reads frames from frame_ring and preprocesses them"""
+        while not rospy.is_shutdown():
+            if not self.frame_ring.wait(timeout=0.1):
+                continue
+            st = time.time()
+            image, _ = self.frame_ring.get()
+            self._put(preproc_q, (image, model.preprocess(image), st))
+
+    def _publish_worker(self, exec_q):
+        """Pipeline stage 3 - formats model outputs as ROS messages and publishes them"""
+        while not rospy.is_shutdown():
+            try:
+                image, model_output, st = exec_q.get(timeout=0.1)
+            except Empty:
+                continue
+            if model_output is None:
+                self.frame_ring.release()
+                continue
+            try:
+                ros_inference_msg = self.construct_ros_msg(model_output, image)
+                self.inference_pub.publish(ros_inference_msg)
+                self.frame_ring.release()
+                self.pub_counter += 1
+                if (self.pub_counter & 31) == 0:
+                    rospy.loginfo_throttle(1.0, f"[{self.pub_counter}]: {self._pub_prefix}")
+                self._iteration_times.append(time.time() - st)
+
+            except CvBridgeError as err:
+                rospy.logerr("Ran into exception when converting message type with CvBridge. See error below:")
+                raise err
+            except ROSSerializationException as err:
+                rospy.logerr("Ran into exception when serializing message for publish. See error below:")
+                raise err
+            except ROSException as err:
+                raise err
+            except ROSInterruptException as err:
+                rospy.loginfo("ROS Interrupt.")
+                raise err
 
     def shutdown(self):
         """Shutdown hook -- computes relevant runtime results for node and shutdown"""
@@ -114,3 +306,7 @@ class BaseInferenceNode:
         rospy.loginfo(f"Average sub_cb time: {round(avg_cb_time, 5)}s")
         rospy.loginfo(f"Average message transfer time from CameraPublisher (publish) -> Inference (subscriber cb): {round(cam2inf_avg_msg_transfer_time, 5)}s")
         rospy.loginfo("Inference node shutdown, release resources...")
+        if self._shared_frames is not None:
+            # stop the subscriber first, so its callback doesn't read from the segment after it is closed
+            self.cam_data_sub.unregister()
+            self._shared_frames.close()
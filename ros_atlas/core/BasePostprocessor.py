@@ -11,11 +11,12 @@ limitations under the License.
 """
 
 from abc import abstractmethod
+import threading
 import time
-from queue import Queue
 from utils.tools import load_model_processor
 
 import rospy
+from rospy.numpy_msg import numpy_msg
 from sensor_msgs.msg import Image
 from rospy.exceptions import ROSInitException
 
@@ -34,7 +35,10 @@ class Postprocessor:
         None
     """
     def __init__(self, expected_img_shape=None):
-        self.message_queue = Queue(maxsize=1)
+        # single-slot mailbox between inference_callback and run - always holds the most recent message
+        self._latest_msg = None
+        self._last_taken_msg = None
+        self._msg_ready = threading.Event()
         self.expected_img_shape = expected_img_shape
 
         # Objects for runtime analysis
@@ -55,7 +59,7 @@ class Postprocessor:
             rospy.init_node("postprocessor")
             self._inference_topic = f"/acl_inference/{self._model_name}"
             self._postprocess_topic = f"/postprocess/{self._model_name}"
-            inference_msg_type = self._model_info["pub_message_type"]       # extracts model-specific MessageType
+            inference_msg_type = numpy_msg(self._model_info["pub_message_type"])       # extracts model-specific MessageType, array fields deserialize as ndarrays
 
             self.inference_sub = rospy.Subscriber(self._inference_topic, inference_msg_type, self.inference_callback, queue_size=1, buff_size=2**24)
             self.postprocess_pub = rospy.Publisher(self._postprocess_topic, Image, queue_size=1)
@@ -72,10 +76,22 @@ class Postprocessor:
         msg_arrival_time = rospy.Time.now()
         self._stamp_dict[msg_publish_time] = msg_arrival_time
 
-        if not self.message_queue.full():
-            self.message_queue.put(msg)
-            self._sub_cb_times.append(time.time() - cb_start)
-        pass
+        self._latest_msg = msg
+        self._msg_ready.set()
+        self._sub_cb_times.append(time.time() - cb_start)
+
+    def next_message(self, timeout=0.1):
+        """Blocks until a new message from inference_callback is available. Returns None if timeout (seconds) expires first.
+        Messages that arrive while run is busy overwrite each other, so run always picks up the freshest inference result.
+        """
+        if not self._msg_ready.wait(timeout):
+            return None
+        self._msg_ready.clear()
+        msg = self._latest_msg
+        if msg is self._last_taken_msg:
+            return None
+        self._last_taken_msg = msg
+        return msg
 
     @abstractmethod
     def deconstruct_ros_msg(self, msg):
@@ -7,9 +7,11 @@ sys.path.append("../../")
 
 import rospy
 from sensor_msgs.msg import Image
-from cv_bridge import CvBridge, CvBridgeError
 from rospy.exceptions import ROSException, ROSSerializationException, ROSInitException, ROSInterruptException
 from ros_atlas.utils.uav_utils import connect_uav
+from ros_atlas.utils.msg_utils import ImageMsgTemplate
+from ros_atlas.core.SharedFrameBuffer import SharedFrameBuffer
+from custom_ros_msgs.msg import SharedFrame
 
 
 class CameraPublisher:
@@ -18,15 +20,24 @@ class CameraPublisher:
     from drone as message data to /TelloDrone/image_raw Topic.
     @params:
         uav     initialized TelloUAV object.                                        @type:TelloUAV
-        fps      rate (Hz) at which to read (and publish) the data from camera      @type:Int 
+        fps      rate (Hz) at which to read (and publish) a pre-recorded video. The live feed is published as fast as the 
+                 drone's stream decodes new frames                                  @type:Int 
         qsize    size of outgoing message queue                                     @type:Int
+        frame_sink  optional callable(frame, stamp) of an inference node living in the same process. When given, frames are 
+                    handed over directly (no serialization) and the host process is expected to have initialized the ROS node.  @type:Callable
+        shared_memory   write frames into a SharedFrameBuffer and only publish the slot index to /tello/cam_data_shm      @type:Bool
     
     Returns:
         CameraPublisher node.
     """
-    def __init__(self, uav=None, fps=10):
+    def __init__(self, uav=None, fps=10, frame_sink=None, shared_memory=False):
         self._uav = uav
         self._pub_counter = 0
+        self._frame_sink = frame_sink
+        self._shared_memory = shared_memory
+        self._shared_frames = None
+        # frames are published in the camera's native BGR order, consumers that need RGB convert on their side
+        self._img_template = ImageMsgTemplate("bgr8")
         
         # for runtime analysis
         self._iteration_times = []
@@ -35,9 +46,13 @@ class CameraPublisher:
             self._uav.streamon()
             print("UAV Stream on.")
         try:
-            rospy.init_node("uav_cam")
-            rospy.loginfo("initializing CameraPublisher node.")
-            self._cam_data_pub = rospy.Publisher("/tello/cam_data_raw", Image, queue_size=1)
+            if self._frame_sink is None:
+                rospy.init_node("uav_cam")
+                rospy.loginfo("initializing CameraPublisher node.")
+                if self._shared_memory:
+                    self._cam_data_pub = rospy.Publisher("/tello/cam_data_shm", SharedFrame, queue_size=1)
+                else:
+                    self._cam_data_pub = rospy.Publisher("/tello/cam_data_raw", Image, queue_size=1)
             self._rate = rospy.Rate(fps)
         except ROSInitException as e:
             rospy.logerr("Ran into exception when initializing uav_cam node.")
@@ -46,21 +61,14 @@ class CameraPublisher:
 
     def convert_and_pubish(self, image_data) -> None:
         st = time.time()
-        # img_msg = cv2.cvtColor(image_data, cv2.COLOR_BGR2RGB)
         try:
-            img_msg = CvBridge().cv2_to_imgmsg(image_data, "rgb8")
-            img_msg.header.stamp = rospy.Time.now()
+            img_msg = self._img_template.fill(image_data, rospy.Time.now())
 
             self._cam_data_pub.publish(img_msg)
-            rospy.loginfo(f"[{self._pub_counter}] Published ImageMessage")
-
             self._pub_counter += 1
-            self._rate.sleep()
-
+            if (self._pub_counter & 31) == 0:
+                rospy.loginfo_throttle(1.0, f"[{self._pub_counter}] Published ImageMessage")
             self._iteration_times.append(time.time()-st)
-        except CvBridgeError as err:
-            rospy.logerr("Ran into exception when converting message type with CvBridge. See error below:")
-            raise err
         except ROSSerializationException as err:
             rospy.logerr("Ran into exception when serializing message for publish. See error below:")
             raise err
@@ -70,6 +78,29 @@ class CameraPublisher:
             rospy.loginfo("ROS Interrupt.")
             raise err
 
+    def forward_frame(self, image_data) -> None:
+        """Intra-process counterpart of convert_and_pubish - passes the ndarray to frame_sink by reference"""
+        st = time.time()
+        self._frame_sink(image_data, rospy.Time.now())
+        self._pub_counter += 1
+        self._iteration_times.append(time.time()-st)
+
+    def write_and_publish(self, image_data) -> None:
+        """Shared memory counterpart of convert_and_pubish - copies the frame into the shared segment and publishes its slot index"""
+        st = time.time()
+        if self._shared_frames is None:
+            self._shared_frames = SharedFrameBuffer(image_data.shape, create=True)
+
+        frame_msg = SharedFrame()
+        frame_msg.header.stamp = rospy.Time.now()
+        frame_msg.generation = self._shared_frames.generation
+        frame_msg.slot, frame_msg.index = self._shared_frames.write(image_data)
+        frame_msg.height, frame_msg.width = image_data.shape[:2]
+        self._cam_data_pub.publish(frame_msg)
+
+        self._pub_counter += 1
+        self._iteration_times.append(time.time()-st)
+
     def start_publish(self, live_feed) -> None:
         cap = None
         if not live_feed:
@@ -83,6 +114,12 @@ class CameraPublisher:
             if image_data is None:
                 rospy.signal_shutdown("Frame is None. Shutting down CameraPublisher.")
                 return
+
+            # live feed is paced by the stream decoder rather than a fixed rate - forward each new frame as soon as it lands
+            if live_feed:
+                if not self._img_template.is_new(image_data):
+                    time.sleep(0.002)
+                    continue
             
             # ensure image_data.shape==(960, 720) if not live-stream
             if image_data.shape != (960, 720):
@@ -90,12 +127,22 @@ class CameraPublisher:
 
             # uncomment to resize before publishing (faster runtime) - also need to specify expect_img_size in Postprocessor
             # image_data = cv2.resize(image_data, (0,0), fx = 0.5, fy = 0.5)
-            self.convert_and_pubish(image_data)
+            if self._frame_sink is not None:
+                self.forward_frame(image_data)
+            elif self._shared_memory:
+                self.write_and_publish(image_data)
+            else:
+                self.convert_and_pubish(image_data)
+
+            if not live_feed:
+                self._rate.sleep()
             
     def shutdown(self) -> None:
         """Shutdown hook"""
         avg_iteration_time = sum(self._iteration_times) / len(self._iteration_times)
         rospy.loginfo(f"CameraPublisher Average iteration time: {round(avg_iteration_time, 5)}")
+        if self._shared_frames is not None:
+            self._shared_frames.close()
         rospy.loginfo("CamerPublisher node shutdown. Release resources...")
 
 if __name__ == "__main__":
@@ -105,12 +152,13 @@ if __name__ == "__main__":
     parser.add_argument("--fps", default=10, type=int, help='Camera publisher FPS (default: 30)')
     parser.add_argument("--live-feed", dest='live_feed', action='store_true', help='Use live-feed from drone')
     parser.add_argument("--no-live-feed", dest='live_feed', action='store_false', help='Run on pre-recorded video')
+    parser.add_argument("--shm", dest='shared_memory', action='store_true', help='Share frames through shared memory, only publish the slot index')
     args = parser.parse_args()
 
     if args.live_feed:
         uav = connect_uav()
     try:
-        imgPub = CameraPublisher(uav=uav, fps=args.fps)
+        imgPub = CameraPublisher(uav=uav, fps=args.fps, shared_memory=args.shared_memory)
         imgPub.start_publish(live_feed=args.live_feed)
     except KeyboardInterrupt as e:
         rospy.signal_shutdown("Shutting down CameraPuyblisher. Keyboard terminate")
\ No newline at end of file
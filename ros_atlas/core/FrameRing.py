@@ -0,0 +1,89 @@
+"""
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import threading
+import numpy as np
+
+
+class FrameRing:
+    """FrameRing - Single-producer/single-consumer ring of preallocated frame buffers.
+    The subscriber callback (producer) copies each incoming frame into the next free slot, the inference loop (consumer) reads
+    slots in order and releases them once the frame is no longer referenced. Buffers are allocated once, on the first frame.
+    When every slot is taken, a new frame replaces the frames that are still unread, so the consumer always picks up the freshest 
+    frame instead of working through a backlog. A lock keeps that rewind from racing with get; an Event lets the consumer sleep 
+    until a frame arrives.
+
+    @params
+        num_slots       number of preallocated frame buffers        @type: Int
+
+    Returns
+        None
+    """
+    def __init__(self, num_slots=5):
+        self._num_slots = num_slots
+        self._slots = None
+        self._stamps = [None] * num_slots
+
+        self._write_idx = 0     # frames written  - advanced by producer
+        self._read_idx = 0      # frames read     - advanced by consumer
+        self._free_idx = 0      # frames released - advanced by consumer
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Event()
+
+    def full(self):
+        return self._write_idx - self._free_idx >= self._num_slots
+
+    def empty(self):
+        return self._read_idx == self._write_idx
+
+    def put(self, frame, stamp, is_intact=None):
+        """Copies frame into the next free slot. If every slot is in use, the unread frames are discarded and frame takes the 
+        oldest of their slots. Returns False (frame dropped) if every slot is held by the consumer, or if is_intact, an optional 
+        callable checked once the copy is done, returns False - the slot is then left free."""
+        with self._lock:
+            if self.full():
+                if self.empty():
+                    return False
+                # unread frames are the newest contiguous run of slots, rewinding over them keeps the ring in order
+                self._write_idx = self._read_idx
+            if self._slots is None:
+                self._slots = [np.empty(frame.shape, dtype=np.uint8) for _ in range(self._num_slots)]
+
+            slot = self._write_idx % self._num_slots
+            np.copyto(self._slots[slot], frame)
+            if is_intact is not None and not is_intact():
+                return False
+            self._stamps[slot] = stamp
+            self._write_idx += 1
+        self._frame_ready.set()
+        return True
+
+    def wait(self, timeout=None):
+        """Blocks until an unread frame is available or timeout (seconds) expires. Returns True if a frame is available."""
+        if not self.empty():
+            return True
+        self._frame_ready.clear()
+        # re-check after clearing, a frame may have landed in between
+        if not self.empty():
+            return True
+        return self._frame_ready.wait(timeout)
+
+    def get(self):
+        """Returns (frame, stamp) of the oldest unread slot. The frame is a view into the ring - call release() once done with it."""
+        with self._lock:
+            slot = self._read_idx % self._num_slots
+            self._read_idx += 1
+            return self._slots[slot], self._stamps[slot]
+
+    def release(self):
+        """Hands the oldest read slot back to the producer."""
+        self._free_idx += 1
@@ -0,0 +1,84 @@
+"""
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+SHM_NAME = "tello_cam_data"
+_HEADER_SIZE = 8    # uint64 count of writes started
+
+
+class SharedFrameBuffer:
+    """SharedFrameBuffer - Ring of camera frames in a named shared memory segment, shared between CameraPublisher and inference nodes.
+    The publisher writes each frame into the next slot (a single memcpy) and only publishes the slot index on /tello/cam_data_shm,
+    subscribers attach to the segment and read the frame in place. A restarted publisher recreates the segment under the same name
+with a new generation, which subscribers use to tell that they need to re-attach. The segment starts with a count of writes 
+started, so a subscriber can check that the publisher hasn't begun overwriting a slot while it was being copied.
+
+    @params
+        shape       frame shape (height, width, channels)                                       @type: Tuple
+        num_slots   number of frames kept in the segment                                        @type: Int
+        create      create the segment (publisher side) or attach to an existing one           @type: Bool
+        name        name of the shared memory segment                                           @type: String
+        generation  id of the segment being attached to, assigned by the creator                @type: Int
+
+    Returns
+        None
+    """
+    def __init__(self, shape, num_slots=4, create=False, name=SHM_NAME, generation=0):
+        self._num_slots = num_slots
+        self._create = create
+        self.generation = time.time_ns() if create else generation
+        size = _HEADER_SIZE + num_slots * int(np.prod(shape))
+
+        if create:
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                # left over by a publisher that did not shut down cleanly
+                stale = shared_memory.SharedMemory(name=name)
+                stale.close()
+                stale.unlink()
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            # the segment is owned by the publisher, do not let this process' resource tracker unlink it on exit
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        self._writes_started = np.ndarray((1,), dtype=np.uint64, buffer=self._shm.buf)
+        self._frames = np.ndarray((num_slots,) + tuple(shape), dtype=np.uint8, buffer=self._shm.buf, offset=_HEADER_SIZE)
+        self._write_idx = 0
+
+    def write(self, frame):
+        """Copies frame into the next slot. Returns (slot, index) - the slot written and the running index of the frame"""
+        index = self._write_idx
+        slot = index % self._num_slots
+        self._writes_started[0] = index + 1
+        np.copyto(self._frames[slot], frame)
+        self._write_idx += 1
+        return slot, index
+
+    def read(self, slot):
+        """Returns a view of the frame in slot - valid until the publisher wraps around to that slot again"""
+        return self._frames[slot]
+
+    def lapped(self, index):
+        """True if the publisher has started overwriting the slot of frame index, i.e. a copy of it taken so far may be torn"""
+        return int(self._writes_started[0]) > index + self._num_slots
+
+    def close(self):
+        self._frames = None
+        self._writes_started = None
+        self._shm.close()
+        if self._create:
+            self._shm.unlink()
@@ -15,17 +15,17 @@ class HandPostprocessNode(Postprocessor):
     
     def deconstruct_ros_msg(self, msg):
         array_1 = np.array(msg.array1.list)
-        array_2 = np.reshape(np.array(msg.array2.list), (1, 10))
-        array_3 = np.reshape(np.array(msg.array3.list), (1, 10))
-        array_4 = np.reshape(np.array(msg.array4.list), (1, 10, 4))
+        array_2 = np.reshape(msg.array2.list, (1, 10))
+        array_3 = np.reshape(msg.array3.list, (1, 10))
+        array_4 = np.reshape(msg.array4.list, (1, 10, 4))
         return [array_1, array_2, array_3, array_4]
     
     def run(self, processor, img_format):
         while not rospy.is_shutdown():
-            st = time.time()
-            if not self.message_queue.empty():
+            message = self.next_message()
+            if message is not None:
                 try:
-                    message = self.message_queue.get()
+                    st = time.time()
                     model_output = self.deconstruct_ros_msg(message)
                     frame = CvBridge().imgmsg_to_cv2(message.img)
 
@@ -42,6 +42,9 @@ class Model(object):
         self._output_dataset = None
         self._model_desc = None          # pointer when using
         self._output_size = 0
+        self._async_stream = None
+        self._async_slots = None
+        self._async_index = 0
         self._init_resource()
         self._is_destroyed = False
         resource_list.register(self)
@@ -62,7 +65,7 @@ class Model(object):
         # get outputs num of model
         self._output_size = acl.mdl.get_num_outputs(self._model_desc)
         # create output dataset
-        self._gen_output_dataset(self._output_size)
+        self._output_dataset = self._gen_output_dataset(self._output_size)
         # recode input data address,if need malloc memory,the memory will be
         # reuseable
         self._init_input_buffer()
@@ -87,8 +90,8 @@ class Model(object):
                 acl.rt.free(buf)
                 acl.destroy_data_buffer(dataset_buffer)
                 utils.check_ret("acl.destroy_data_buffer", ret)
-        self._output_dataset = dataset
         log_info("Create model output dataset success")
+        return dataset
 
     def _init_input_buffer(self):
         self._input_num = acl.mdl.get_num_inputs(self._model_desc)
@@ -96,6 +99,17 @@ class Model(object):
             item = {"addr": None, "size": 0}
             self._input_buffer.append(item)
 
+    def _init_async_resource(self):
+        # two sets of device input/output buffers used alternately, so one
+        # inference can run while the previous one's outputs are copied back
+        self._async_stream, ret = acl.rt.create_stream()
+        utils.check_ret("acl.rt.create_stream", ret)
+        second_buffer = [{"addr": None, "size": 0}
+                         for _ in range(self._input_num)]
+        self._async_slots = [
+            (self._input_buffer, self._output_dataset),
+            (second_buffer, self._gen_output_dataset(self._output_size))]
+
     def _gen_input_dataset(self, input_list):
         ret = const.SUCCESS
         if len(input_list) != self._input_num:
@@ -200,13 +214,56 @@ class Model(object):
 
         return self._output_dataset_to_numpy()
 
-    def _output_dataset_to_numpy(self):
+    def execute_async(self, input_list):
+        """
+        submit inference of input data and return without waiting for it
+        Args:
+            input_list: input data list, same as execute
+        returns:
+            AsyncExecution handle, whose wait() returns the inference result
+            like execute does. Submissions alternate between two sets of
+            device buffers, so wait on a handle before submitting two more.
+            None if the submission failed
+        """
+        if self._async_slots is None:
+            self._init_async_resource()
+        self._input_buffer, output_dataset = \
+            self._async_slots[self._async_index]
+        self._async_index ^= 1
+
+        ret = self._gen_input_dataset(input_list)
+        if ret == const.FAILED:
+            log_error("Gen model input dataset failed")
+            return None
+        input_dataset = self._input_dataset
+        self._input_dataset = None
+
+        ret = acl.mdl.execute_async(self._model_id,
+                                    input_dataset,
+                                    output_dataset,
+                                    self._async_stream)
+        if ret != const.ACL_ERROR_NONE:
+            log_error("Execute model failed for acl.mdl.execute_async error ",
+                      ret)
+            self._release_dataset(input_dataset)
+            return None
+
+        event, ret = acl.rt.create_event()
+        utils.check_ret("acl.rt.create_event", ret)
+        ret = acl.rt.record_event(event, self._async_stream)
+        utils.check_ret("acl.rt.record_event", ret)
+
+        return AsyncExecution(self, event, input_dataset, output_dataset)
+
+    def _output_dataset_to_numpy(self, output_dataset=None):
+        if output_dataset is None:
+            output_dataset = self._output_dataset
         dataset = []
         output_tensor_list = self._gen_output_tensor()
-        num = acl.mdl.get_dataset_num_buffers(self._output_dataset)
+        num = acl.mdl.get_dataset_num_buffers(output_dataset)
 
         for i in range(num):
-            buf = acl.mdl.get_dataset_buffer(self._output_dataset, i)
+            buf = acl.mdl.get_dataset_buffer(output_dataset, i)
             data = acl.get_data_buffer_addr(buf)
             size = int(acl.get_data_buffer_size(buf))
             output_ptr = output_tensor_list[i]["ptr"]
@@ -294,6 +351,11 @@ class Model(object):
         if self._is_destroyed:
             return
 
+        if self._async_stream:
+            acl.rt.synchronize_stream(self._async_stream)
+            self._release_dataset(self._async_slots[1][1], free_memory=True)
+            acl.rt.destroy_stream(self._async_stream)
+            self._async_stream = None
         self._release_dataset(self._output_dataset, free_memory=True)
         if self._model_id:
             ret = acl.mdl.unload(self._model_id)
@@ -311,3 +373,33 @@ class Model(object):
 
     def __del__(self):
         self.destroy()
+
+
+class AsyncExecution(object):
+    """
+    handle of an inference submitted by Model.execute_async
+    """
+
+    def __init__(self, model, event, input_dataset, output_dataset):
+        self._model = model
+        self._event = event
+        self._input_dataset = input_dataset
+        self._output_dataset = output_dataset
+
+    def wait(self):
+        """
+        block until the inference finishes
+        Args:
+            null
+        Returns:
+            inference result data, which is a numpy array list,
+            each corresponse to a model output. None on failure
+        """
+        ret = acl.rt.synchronize_event(self._event)
+        acl.rt.destroy_event(self._event)
+        self._model._release_dataset(self._input_dataset)
+        if ret != const.ACL_ERROR_NONE:
+            log_error("Wait model execution failed, error ", ret)
+            return None
+
+        return self._model._output_dataset_to_numpy(self._output_dataset)
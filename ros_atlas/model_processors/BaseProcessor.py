@@ -14,6 +14,7 @@ limitations under the License.
 
 import os 
 import sys
+import numpy as np
 from abc import abstractmethod
 
 from ros_atlas.lib.atlas_utils.acl_resource import AclResource
@@ -31,12 +32,25 @@ class BaseProcessor:
             self._acl_resource.init()
             self.model = Model(params['model_path'])
 
+        # preallocated preprocess outputs, cycled so a frame still queued for execution is not overwritten
+        self.num_buffers = 4
+        self._buffers = None
+        self._buffer_idx = 0
+
     def validate(self):
         if not os.path.exists(self.params['model_path']):
             raise FileNotFoundError('Model Path not found, please check again.')
         if 'model_width' not in self.params or 'model_height' not in self.params:
             raise Exception('Please specify input width and height for model in params.py')
 
+    def _next_buffer(self, shape, dtype=np.float32):
+        """Returns the next preallocated preprocess output buffer. Buffers are allocated on first use."""
+        if self._buffers is None:
+            self._buffers = [np.empty(shape, dtype=dtype) for _ in range(self.num_buffers)]
+        buf = self._buffers[self._buffer_idx]
+        self._buffer_idx = (self._buffer_idx + 1) % self.num_buffers
+        return buf
+
     @abstractmethod
     def preprocess(self):
         pass
@@ -16,6 +16,7 @@ import numpy as np
 import time
 
 from model_processors.BaseProcessor import BaseProcessor
+from model_processors.preprocess_numba import letterbox_normalize
 
 
 class ModelProcessor(BaseProcessor):
@@ -29,6 +30,10 @@ class ModelProcessor(BaseProcessor):
         self.nw = int(self.iw * self.scale)
         self.nh = int(self.ih * self.scale)
 
+        # run the Numba kernel once on a dummy frame, so it is compiled (or loaded from cache) at startup instead of on the first frame
+        if not process_only:
+            letterbox_normalize(np.zeros((self.nh, self.nw, 3), np.uint8), np.empty((self.h, self.w, 3), np.float32), 0, 0, 128 / 255.)
+
         # parameters for postprocessing
         self.image_shape = expected_image_shape if expected_image_shape is not None else [params['camera_height'], params['camera_width']]
         self.model_shape = [self.h, self.w]
@@ -45,14 +50,10 @@ class ModelProcessor(BaseProcessor):
 
     def preprocess(self, frame):
         """preprocess frame from drone"""
-        # preprocessing: resize and paste input image to a new image with size 416*416
-        img = np.array(frame, dtype='float32')
-        img_resize = cv2.resize(img, (self.nw, self.nh), interpolation=cv2.INTER_CUBIC)
-        img_new = np.ones((416, 416, 3), np.float32) * 128
-        img_new[(self.h - self.nh) // 2: ((self.h - self.nh) // 2 + self.nh),
-                (self.w - self.nw) // 2: (self.w - self.nw) // 2 + self.nw, :] = img_resize[:, :, :]
-        img_new = img_new / 255.
-        return img_new
+        # preprocessing: resize and paste input image to a new image with size 416*416, scaled to [0, 1] in one fused pass
+        img_resize = cv2.resize(frame, (self.nw, self.nh), interpolation=cv2.INTER_CUBIC)
+        img_new = self._next_buffer((self.h, self.w, 3))
+        return letterbox_normalize(img_resize, img_new, (self.h - self.nh) // 2, (self.w - self.nw) // 2, 128 / 255.)
         
     def postprocess(self, outputs, frame):
         box_axis, box_score = yolo_eval(outputs, self.anchors, self.num_classes, self.image_shape)
@@ -19,6 +19,7 @@ from PIL import Image
 import matplotlib.pyplot as plt
 
 from model_processors.BaseProcessor import BaseProcessor
+from model_processors.preprocess_numba import fused_preproc
 
 
 class ModelProcessor(BaseProcessor):
@@ -28,6 +29,13 @@ class ModelProcessor(BaseProcessor):
         # parameters for poseprocessing
         self.ih, self.iw = (params['camera_height'], params['camera_width'])
 
+        # parameters for preprocessing
+        self.mean = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+        self.std = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+        # run the Numba kernel once on a dummy frame, so it is compiled (or loaded from cache) at startup instead of on the first frame
+        if not process_only:
+            fused_preproc(np.zeros((self.ih, self.iw, 3), np.uint8), self.mean, self.std, np.empty((1, 3, 480, 640), np.float32))
 
     def predict(self, frame):
         preprocessed = self.preprocess(frame)
@@ -37,16 +45,10 @@ class ModelProcessor(BaseProcessor):
 
     def preprocess(self, img):
         """preprocess frame from drone"""
-        # preprocessing: resize and paste input image to a new image with size 416*416
-        img = cv2.resize(img, (640, 480), interpolation = cv2.INTER_AREA) / 255.
-        img = img.transpose((2, 0, 1))
-        # normalize
-        mean = [0.485, 0.456, 0.406]
-        std = [0.229, 0.224, 0.225]
-        for channel in range(3):
-            img[channel] = (img[channel] - mean[channel]) / std[channel]
-        img = np.expand_dims(img, axis=0)
-        return img.astype(np.float32).copy()
+        # preprocessing: bilinear resize to 640*480, BGR->RGB (frames arrive as bgr8, AdaBins expects RGB), rescale, normalize and 
+        # transpose to NCHW - all fused into a single pass
+        out = self._next_buffer((1, 3, 480, 640))
+        return fused_preproc(img, self.mean, self.std, out)
         
     def postprocess(self, outputs, frame=None):
         """postprocess frame from drone"""
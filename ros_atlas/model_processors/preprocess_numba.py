@@ -0,0 +1,81 @@
+"""
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True, nogil=True, fastmath=True)
+def letterbox_normalize(src, out, top, left, fill):
+    """Pastes src into out at (top, left) scaled to [0, 1], and fills the remaining border with fill - in a single pass over out
+    @params:
+        src     - resized frame                     @type:ndarray (hxwx3, uint8)
+        out     - preallocated model input          @type:ndarray (HxWx3, float32)
+        top     - row offset of src in out          @type:Int
+        left    - column offset of src in out       @type:Int
+        fill    - value of the letterbox border     @type:Float
+    Returns:
+        out
+    """
+    out_h, out_w = out.shape[0], out.shape[1]
+    src_h, src_w = src.shape[0], src.shape[1]
+    inv255 = np.float32(1.0 / 255.0)
+    for y in prange(out_h):
+        sy = y - top
+        for x in range(out_w):
+            sx = x - left
+            if sy >= 0 and sy < src_h and sx >= 0 and sx < src_w:
+                for c in range(3):
+                    out[y, x, c] = src[sy, sx, c] * inv255
+            else:
+                for c in range(3):
+                    out[y, x, c] = fill
+    return out
+
+
+@njit(parallel=True, cache=True, nogil=True, fastmath=True)
+def fused_preproc(src, mean, std, out):
+    """Fused bilinear resize, BGR->RGB swap, rescale, mean/std normalization and HWC->NCHW transpose. Each output pixel is sampled 
+    once from src and written as out[0, c, y, x] = (rgb[y, x, c] / 255 - mean[c]) / std[c], so the full-size frame is read in one pass.
+    @params:
+        src     - camera frame                              @type:ndarray (hxwx3, uint8, BGR)
+        mean    - per-channel mean (RGB order)              @type:ndarray (3, float32)
+        std     - per-channel standard deviation            @type:ndarray (3, float32)
+        out     - preallocated model input                  @type:ndarray (1x3xHxW, float32, RGB)
+    Returns:
+        out
+    """
+    src_h, src_w = src.shape[0], src.shape[1]
+    out_h, out_w = out.shape[2], out.shape[3]
+    scale_y = np.float32(src_h / out_h)
+    scale_x = np.float32(src_w / out_w)
+    inv255 = np.float32(1.0 / 255.0)
+    for y in prange(out_h):
+        # half-pixel aligned source coordinate, same convention as cv2.INTER_LINEAR
+        fy = max((y + np.float32(0.5)) * scale_y - np.float32(0.5), np.float32(0.0))
+        y0 = min(int(fy), src_h - 1)
+        y1 = min(y0 + 1, src_h - 1)
+        wy = min(fy - y0, np.float32(1.0))
+        for x in range(out_w):
+            fx = max((x + np.float32(0.5)) * scale_x - np.float32(0.5), np.float32(0.0))
+            x0 = min(int(fx), src_w - 1)
+            x1 = min(x0 + 1, src_w - 1)
+            wx = min(fx - x0, np.float32(1.0))
+            for c in range(3):
+                sc = 2 - c
+                top = src[y0, x0, sc] + (src[y0, x1, sc] - np.float32(src[y0, x0, sc])) * wx
+                bottom = src[y1, x0, sc] + (src[y1, x1, sc] - np.float32(src[y1, x0, sc])) * wx
+                value = top + (bottom - top) * wy
+                out[0, c, y, x] = (value * inv255 - mean[c]) / std[c]
+    return out
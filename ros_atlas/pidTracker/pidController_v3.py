@@ -6,12 +6,13 @@ from smach import StateMachine, CBState
 import smach_ros
 from actionlib import *
 from actionlib_msgs.msg import *
+from sensor_msgs.msg import Image
 
 
 sys.path.append("../../")
 try:
     from ros_atlas.utils.uav_utils import connect_uav, manual_control
-    from ros_atlas.base_nodes.CameraPublisher import CameraPublisher
+    from ros_atlas.utils.msg_utils import ImageMsgTemplate
     from custom_ros_action.msg import InitDroneGoal, InitDroneResult, InitDroneFeedback, InitDroneAction, MoveAgentAction, MoveAgentGoal
 except ImportError as err:
     raise err
@@ -23,16 +24,17 @@ class PIDTrackServer:
         self._init_sas_result = InitDroneResult()
 
         self._manual_sas = SimpleActionServer('manual_control', MoveAgentAction, execute_cb=self.execute_manual_cb, auto_start=False)
-        
-        # can probably condense this into one SAS 
-        self._inference_sas =  SimpleActionServer('infer', InferAction, execute_cb=self.execute_inference_cb, auto_start=False)
-        # self._track_sas =  SimpleActionServer('pid_track', TrackAction, execute_cb=self.execute_track_cb, auto_start=False)
+
+        # frames are streamed from a single timer tick rather than a long-running action server thread per task
+        self._cam_data_pub = rospy.Publisher("/tello/cam_data_raw", Image, queue_size=1)
+        self._img_template = ImageMsgTemplate("bgr8")
+        self._frame_read = None
+        self._tick_timer = None
 
         self._uav = None
 
         self._init_sas.start()
         self._manual_sas.start()
-        self._search_sas.start()
 
     def execute_init_cb(self, goal):
         """Optional callback that gets called in a separate thread whenever a new goal is received, 
@@ -57,8 +59,8 @@ class PIDTrackServer:
                     self._uav = connect_uav()
                     if self._uav is not None:
                         self.connect_start = time.time()
-                        # self._uav.streamon()
                         rospy.loginfo("@init_cb: Tello Drone connection established.")
+                        self.start_stream()
                         self._init_sas_result.result = True
                         self._init_sas.set_succeeded(self._init_sas_result)
                 except Exception as err:
@@ -77,6 +79,7 @@ class PIDTrackServer:
                 raise err
 
         elif goal.type == "land":
+            self.stop_stream()
             self._uav.land()
             self.land_start = time.time()
             rospy.loginfo(f"@land: time taken from takeoff to land: {round(self.land_start-self.takeoff_start, 3)}")
@@ -131,24 +134,25 @@ class PIDTrackServer:
             rospy.loginfo("Dismiss manual control, starting PIDTrack mode")
             self._manual_sas.set_aborted()
 
-    def execute_inference_cb(self, goal):
-        """
-        So far -- it seems like the inference needs to be in the same state as search // track
-        1. inference cannot be a separate state b/c search and track both continuous need it. 
-        2. inference can be thought of as a core subroutine for either search and track.
-        3. either way -- drone NEEDS to be in a state where it continuously streams data (inference of data can be done from other node and listen for result)
-
-        """
-        
-        # 1. fetch frame from drone's stream -- and publish it to AclInference & subscribe to Postprocessing node
-        rospy.loginfo("@inference_cb: ")
-        camPub = CameraPublisher(self._uav)
-        camPub.start_publish_live()
-
-
-        # 2. preprocess, execute, postprocess results (bbox coordinates -- center and area)
-        #   a. if no bbox area && center -> search mode
-        #   b. if object is "presence" (have bbox and center) -> track mode
+    def start_stream(self):
+        """Turns on the drone's video stream and starts the 30Hz tick that publishes it to /tello/cam_data_raw, where the 
+        inference nodes pick it up. Search/track decisions are made downstream from the inference results."""
+        self._uav.streamon()
+        # creating the frame reader opens the video capture and can block for seconds, keep that out of the timer callback
+        self._frame_read = self._uav.get_frame_read()
+        self._tick_timer = rospy.Timer(rospy.Duration(1 / 30), self.tick)
+
+    def stop_stream(self):
+        if self._tick_timer is not None:
+            self._tick_timer.shutdown()
+            self._tick_timer = None
+
+    def tick(self, event):
+        """Timer callback - publishes the latest decoded frame, skipping it if the decoder hasn't produced a new one since the last tick"""
+        frame = self._frame_read.frame
+        if frame is None or not self._img_template.is_new(frame):
+            return
+        self._cam_data_pub.publish(self._img_template.fill(frame, rospy.Time.now()))
 
 
 # http://wiki.ros.org/smach/Tutorials/Simple%20Action%20State
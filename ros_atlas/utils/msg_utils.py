@@ -0,0 +1,55 @@
+from sensor_msgs.msg import Image
+
+
+def make_image_msg(arr, stamp, encoding="bgr8"):
+    """Builds a sensor_msgs/Image from an 8-bit, 3-channel frame without going through CvBridge.
+    Only sets the fields a subscriber needs and copies the pixel buffer once (ndarray.tobytes).
+    @params:
+        arr         - frame to wrap                         @type:ndarray (HxWx3, uint8)
+        stamp       - header timestamp                      @type:rospy.Time
+        encoding    - pixel encoding of arr                 @type:String
+    Returns:
+        sensor_msgs/Image message
+    """
+    img_msg = Image()
+    img_msg.header.stamp = stamp
+    img_msg.height = arr.shape[0]
+    img_msg.width = arr.shape[1]
+    img_msg.encoding = encoding
+    img_msg.is_bigendian = 0
+    img_msg.step = arr.shape[1] * 3
+    img_msg.data = arr.tobytes()
+    return img_msg
+
+
+class ImageMsgTemplate:
+    """Reuses a single sensor_msgs/Image for a stream of same-sized frames. Size and encoding are filled in on the first frame, 
+    later frames only refill header.stamp and data - rospy serializes inside publish(), so the message can be refilled right after.
+    @params:
+        encoding    - pixel encoding of the frames          @type:String
+    """
+    def __init__(self, encoding="bgr8"):
+        self._encoding = encoding
+        self._msg = None
+        self._last_frame = None
+
+    def is_new(self, frame):
+        """False if frame is the same object as on the previous call - djitellopy keeps returning the last decoded frame until 
+        a new one lands"""
+        if frame is self._last_frame:
+            return False
+        self._last_frame = frame
+        return True
+
+    def fill(self, frame, stamp):
+        """Returns the Image message holding frame
+        @params:
+            frame       - frame to wrap                         @type:ndarray (HxWx3, uint8)
+            stamp       - header timestamp                      @type:rospy.Time
+        """
+        if self._msg is None:
+            self._msg = make_image_msg(frame, stamp, self._encoding)
+        else:
+            self._msg.header.stamp = stamp
+            self._msg.data = frame.tobytes()
+        return self._msg
@@ -1,3 +1,4 @@
+import argparse
 import sys
 import os
 from importlib import import_module
@@ -58,6 +59,19 @@ def load_model_processor(model_name, display_info=True):
         if MP is None:
             raise Exception("Model name not found in params, see params.py for supported models.")
 
+def inference_node_parser(description):
+    """ArgumentParser with the options shared by every inference node - frame transport and BaseInferenceNode's pipeline settings
+    :param:
+        + description - description of the node
+    Returns
+        argparse.ArgumentParser, nodes can add their own arguments before parsing
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--max-batch-size", dest='max_batch_size', default=1, type=int, help='Frames per model execution, must match the batch size the model was converted with (default: 1)')
+    parser.add_argument("--max-latency-ms", dest='max_latency_ms', default=0, type=int, help='How long to wait for more frames to fill a batch (default: 0)')
+    parser.add_argument("--shm", dest='shared_memory', action='store_true', help='Read frames from a CameraPublisher started with --shm')
+    return parser
+
 def get_acl_rt_mem_info():
     """Prints Acl runtime memory info"""
     for i in range(10):
@@ -1,6 +1,5 @@
 import sys
 import cv2
-import numpy as np
 
 sys.path.append("..")
 
@@ -107,12 +106,12 @@ class PIDFaceTracker(TelloPIDController):
         # Localization of ToI to the center x-axis - adjusts camera angle
         if x_err != 0:
             yaw_velocity = self._pid(x_err, prev_x_err)
-            yaw_velocity = int(np.clip(yaw_velocity, -100, 100))
+            yaw_velocity = int(self._clamp(yaw_velocity, -100, 100))
 
         # Localization of ToI to the center y-axis - adjust altitude 
         if y_err != 0:
-            up_down_velocity = 3*self._pid(y_err, prev_y_err)
-            up_down_velocity = int(np.clip(up_down_velocity, -50, 50))
+            up_down_velocity = self._y_gain*self._pid(y_err, prev_y_err)
+            up_down_velocity = int(self._clamp(up_down_velocity, -50, 50))
 
         # Rectify distance between drone and target from bbox area: Adjusts forward and backward motion
         if area > self.setpoint_area[0] and area < self.setpoint_area[1]:
@@ -164,20 +163,18 @@ class PIDFaceTracker(TelloPIDController):
         result_img, process_vars = self._unpack_feedback(infer_output, frame)
         area, center = process_vars[0], process_vars[1]
 
-        cur_mode = "TRACK" if self.track_mode else "SEARCH"
+        cur_mode = self._mode_name()
         sample_val = center if center is None else "Presence"
         filtered_result = self.inference_filter.sample(sample_val)
 
         if filtered_result == "MODE_INFERENCE_SAMPLING":
             pass
         elif filtered_result == "Presence": 
-            self.track_mode = True
-            self.search_mode = False
+            self._mode_fn = self._track_step
         elif filtered_result is None:
-            self.track_mode = False
-            self.search_mode = True
+            self._mode_fn = self._search_step
         
-        new_mode =  "TRACK" if self.track_mode else "SEARCH"
+        new_mode = self._mode_name()
         if cur_mode != new_mode: 
             print("\n######################################################")
             print(f"Mode switched from {cur_mode} to {new_mode}")
@@ -186,12 +183,8 @@ class PIDFaceTracker(TelloPIDController):
     
     def run_state_machine(self, frame, prev_x_err, prev_y_err):
         result_img, process_vars = self._manage_state(frame)
-        if self.search_mode:
-            self._search()
-            return prev_x_err, prev_y_err, result_img
-        elif self.track_mode:
-            x_err, y_err = self._track(process_vars, prev_x_err, prev_y_err)
-            return x_err, y_err, result_img
-    
+        x_err, y_err = self._mode_fn(process_vars, prev_x_err, prev_y_err)
+        return x_err, y_err, result_img
+
     def __repr__(self):
         return f"PIDFaceTracker(pid={self.pid}, inference_filter={self.inference_filter})"
\ No newline at end of file
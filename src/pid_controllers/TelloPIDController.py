@@ -41,10 +41,15 @@ class TelloPIDController:
     def __init__(self, pid=[0.1, 0.1, 0.1], save_flight_hist=False):
         self.pid = pid
         self.save_flight_hist = save_flight_hist
+
+        # gains hoisted out of the control loop: _pid only uses the error delta for both I and D terms, so they fold into one multiplier
+        self._kp = float(pid[0])
+        self._ki_plus_kd = float(pid[1]) + float(pid[2])
+        self._y_gain = 3.0
         self.setpoint_center = (480, 360)
         self.history = []
-        self.search_mode = True
-        self.track_mode = False
+        # current mode as the control step to run on each frame - starts in SEARCH, swapped by _manage_state
+        self._mode_fn = self._search_step
 
     @staticmethod
     def _load_mp(detector_name):
@@ -60,6 +65,11 @@ class TelloPIDController:
         MP = getattr(MP, "ModelProcessor")
         return MP(model_info)
     
+    @staticmethod
+    def _clamp(value, lower, upper):
+        """Clamps a scalar to [lower, upper] - avoids the ndarray round-trip of np.clip on the control loop"""
+        return lower if value < lower else upper if value > upper else value
+
     @staticmethod
     def _load_filter(Filter, **kwargs):
         """Internal method to initialize and load an Inference Filter
@@ -103,7 +113,7 @@ class TelloPIDController:
     
     def _pid(self, error, prev_error):
         """PID Output signal equation"""
-        return self.pid[0]*error + self.pid[1]*(error-prev_error) + self.pid[2]*(error-prev_error)
+        return self._kp*error + self._ki_plus_kd*(error-prev_error)
 
     @abstractmethod
     def _unpack_feedback(self, inference_info, frame):
@@ -117,6 +127,18 @@ class TelloPIDController:
     def _search(self):
         pass
 
+    def _search_step(self, process_vars, prev_x_err, prev_y_err):
+        """One control iteration in Search Mode - errors are carried over untouched"""
+        self._search()
+        return prev_x_err, prev_y_err
+
+    def _track_step(self, process_vars, prev_x_err, prev_y_err):
+        """One control iteration in Track Mode"""
+        return self._track(process_vars, prev_x_err, prev_y_err)
+
+    def _mode_name(self):
+        return "TRACK" if self._mode_fn == self._track_step else "SEARCH"
+
     @abstractmethod
     def _manage_state(self):
         pass